@@ -6,406 +6,251 @@ This script converts ITC2021 Sports Timetabling XML instances to ASP facts
 that can be used with the provided ASP encoding.
 
 Usage: python parser.py input.xml output.lp
+       python parser.py --batch instances/ facts/
 """
 
-import xml.etree.ElementTree as ET
+import io
+import os
+import re
 import sys
+import glob
 import argparse
-from typing import List, Dict, Set
+from functools import lru_cache
+from itertools import count
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# lxml parses in libxml2; fall back to the stdlib parser if it is missing
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+_MEETING_RE = re.compile(r'(\d+)\s*,\s*(\d+)')
+
+# Constraint layout per XML tag: the *_param attributes (in output order)
+# with their defaults, and the list attributes with the parser used to
+# expand them into one fact per element
+CONSTRAINT_SPECS: Dict[str, Dict[str, Tuple[Tuple[str, str], ...]]] = {
+    'CA1': {  # Capacity
+        'params': (('type', 'HARD'), ('max', '0'), ('min', '0'), ('mode', 'H'), ('penalty', '1')),
+        'lists': (('teams', 'parse_range'), ('slots', 'parse_list')),
+    },
+    'CA2': {  # Capacity vs Opponent Set
+        'params': (('type', 'HARD'), ('max', '0'), ('min', '0'), ('mode1', 'H'), ('mode2', 'GLOBAL'),
+                   ('penalty', '1')),
+        'lists': (('teams1', 'parse_range'), ('teams2', 'parse_range'), ('slots', 'parse_list')),
+    },
+    'CA3': {  # Consecutive Games
+        'params': (('type', 'HARD'), ('max', '0'), ('min', '0'), ('mode1', 'H'), ('mode2', 'SLOTS'),
+                   ('intp', '1'), ('penalty', '1')),
+        'lists': (('teams1', 'parse_range'), ('teams2', 'parse_range')),
+    },
+    'CA4': {  # Group Capacity
+        'params': (('type', 'HARD'), ('max', '0'), ('min', '0'), ('mode1', 'H'), ('mode2', 'GLOBAL'),
+                   ('penalty', '1')),
+        'lists': (('teams1', 'parse_range'), ('teams2', 'parse_range'), ('slots', 'parse_list')),
+    },
+    'GA1': {  # Game Assignment
+        'params': (('type', 'HARD'), ('max', '1'), ('min', '0'), ('penalty', '1')),
+        'lists': (('meetings', 'parse_meetings'), ('slots', 'parse_list')),
+    },
+    'BR1': {  # Break per Team
+        'params': (('type', 'HARD'), ('intp', '0'), ('mode1', 'LEQ'), ('mode2', 'HA'), ('penalty', '1')),
+        'lists': (('teams', 'parse_range'), ('slots', 'parse_list')),
+    },
+    'BR2': {  # Global Break
+        'params': (('type', 'HARD'), ('intp', '0'), ('homeMode', 'HA'), ('mode2', 'LEQ'), ('penalty', '1')),
+        'lists': (('teams', 'parse_range'), ('slots', 'parse_range')),
+    },
+    'FA2': {  # Fairness
+        'params': (('type', 'SOFT'), ('intp', '1'), ('penalty', '1')),
+        'lists': (('teams', 'parse_range'), ('slots', 'parse_range')),
+    },
+    'SE1': {  # Separation
+        'params': (('type', 'SOFT'), ('min', '1'), ('penalty', '1')),
+        'lists': (('teams', 'parse_range'),),
+    },
+}
+
+# String-valued parameters, quoted in the generated facts
+_QUOTED_PARAMS = {'mode', 'mode1', 'mode2', 'homeMode'}
+
+
+def _param_template(kind: str, params: Tuple[Tuple[str, str], ...]) -> str:
+    """Build the *_param block template for one constraint kind."""
+    lines = []
+    for attr, _ in params:
+        value = f'"{{{attr}}}"' if attr in _QUOTED_PARAMS else f'{{{attr}}}'
+        lines.append(f'{kind}_param({{cid}}, {attr}, {value}).\n')
+    return ''.join(lines)
+
+
+# Param block templates, built once at import and filled with format_map
+_PARAM_TMPLS = {tag: _param_template(tag.lower(), spec['params'])
+                for tag, spec in CONSTRAINT_SPECS.items()}
+
+# Param defaults per tag, overlaid with the element's attributes in one merge
+_PARAM_DEFAULTS = {tag: dict(spec['params']) for tag, spec in CONSTRAINT_SPECS.items()}
+
+
+@lru_cache(maxsize=None)
+def _parse_ints(text: str) -> Tuple[int, ...]:
+    """Parse a stripped ';'-separated list of integers, skipping empty tokens.
+
+    Instances repeat the same slot/team lists across many constraints, so
+    each distinct string is only converted once.
+    """
+    return tuple(int(t) for t in text.split(';') if t.strip())
+
+
+def _contig_runs(xs: Sequence[int]) -> Iterator[Tuple[int, int]]:
+    """Yield (first, last) of each run of consecutive values in sorted xs."""
+    if not xs:
+        return
+    start = prev = xs[0]
+    for x in xs[1:]:
+        if x == prev + 1:
+            prev = x
+        else:
+            yield start, prev
+            start = prev = x
+    yield start, prev
+
+
+# Constraint id formats per XML tag, e.g. 'CA1' -> 'ca1_{}'
+_CID_FORMATS = {tag: f'{tag.lower()}_{{}}' for tag in CONSTRAINT_SPECS}
 
 
 class ITC2021Parser:
-    def __init__(self):
-        self.constraint_counters = {
-            'ca1': 0, 'ca2': 0, 'ca3': 0, 'ca4': 0,
-            'ga1': 0, 'br1': 0, 'br2': 0, 'fa2': 0, 'se1': 0
-        }
-        self.facts = []
+    def __init__(self) -> None:
+        self.constraint_ids: Dict[str, Iterator[str]] = {}
+        self.buf: io.StringIO = io.StringIO()
+        self.reset()
 
-    def parse_list(self, text: str) -> List[int]:
+    def reset(self) -> None:
+        """Restart constraint numbering and clear the output buffer."""
+        # One id source per kind yielding 'ca1_1', 'ca1_2', ...; the prefix
+        # is baked into the format string and the counter runs in C
+        self.constraint_ids = {tag: map(fmt.format, count(1)) for tag, fmt in _CID_FORMATS.items()}
+        self.buf.seek(0)
+        self.buf.truncate()
+
+    def parse_list(self, text: Optional[str]) -> Sequence[int]:
         """Parse semicolon-separated list of integers."""
-        if not text or text.strip() == "":
-            return []
-        return [int(x.strip()) for x in text.split(';') if x.strip()]
+        text = text and text.strip(' ;')
+        return _parse_ints(text) if text else ()
 
-    def parse_range(self, text: str) -> List[int]:
+    def parse_range(self, text: Optional[str]) -> Sequence[int]:
         """Parse range notation like '0..19' or regular list."""
-        if not text or text.strip() == "":
+        text = text and text.strip(' ;')
+        if not text:
             return []
         
-        text = text.strip()
         if '..' in text:
-            # Handle range notation
-            parts = text.split('..')
-            if len(parts) == 2:
-                start, end = int(parts[0]), int(parts[1])
-                return list(range(start, end + 1))
+            # Handle range notation; callers only iterate, so keep it lazy
+            start, end = text.split('..', 1)
+            return range(int(start), int(end) + 1)
         
         # Handle regular semicolon-separated list
-        return self.parse_list(text)
+        return _parse_ints(text)
 
-    def parse_meetings(self, text: str) -> List[tuple]:
+    def parse_meetings(self, text: Optional[str]) -> List[Tuple[int, int]]:
         """Parse meetings like '0,1;1,2;' into list of tuples."""
-        if not text or text.strip() == "":
-            return []
+        return [(int(t1), int(t2)) for t1, t2 in _MEETING_RE.findall(text or '')]
+
+    def write_resource_ids(self, name: str, ids: List[int]) -> None:
+        """Write num_<name>s and either a compact range or one fact per id."""
+        if not ids:
+            return
         
-        meetings = []
-        for meeting in text.split(';'):
-            meeting = meeting.strip()
-            if meeting and ',' in meeting:
-                parts = meeting.split(',')
-                if len(parts) == 2:
-                    meetings.append((int(parts[0].strip()), int(parts[1].strip())))
-        return meetings
-
-    def add_fact(self, fact: str):
-        """Add a fact to the output."""
-        self.facts.append(fact)
-
-    def get_constraint_id(self, constraint_type: str) -> str:
-        """Generate unique constraint ID."""
-        self.constraint_counters[constraint_type] += 1
-        return f"{constraint_type}_{self.constraint_counters[constraint_type]}"
-
-    def parse_basic_structure(self, root):
-        """Parse teams, slots, and basic format information."""
-        # Parse teams
-        teams = root.find('.//Teams')
-        if teams is not None:
-            team_ids = []
-            for team in teams.findall('team'):
-                team_id = int(team.get('id'))
-                team_ids.append(team_id)
-                self.add_fact(f"team({team_id}).")
-            
-            if team_ids:
-                num_teams = len(team_ids)
-                max_team = max(team_ids)
-                min_team = min(team_ids)
-                self.add_fact(f"num_teams({num_teams}).")
-                if min_team == 0 and max_team == num_teams - 1:
-                    self.add_fact(f"team(0..{max_team}).")
-                else:
-                    for tid in team_ids:
-                        self.add_fact(f"team({tid}).")
-
-        # Parse slots
-        slots = root.find('.//Slots')
-        if slots is not None:
-            slot_ids = []
-            for slot in slots.findall('slot'):
-                slot_id = int(slot.get('id'))
-                slot_ids.append(slot_id)
-                self.add_fact(f"slot({slot_id}).")
-            
-            if slot_ids:
-                num_slots = len(slot_ids)
-                max_slot = max(slot_ids)
-                min_slot = min(slot_ids)
-                self.add_fact(f"num_slots({num_slots}).")
-                if min_slot == 0 and max_slot == num_slots - 1:
-                    self.add_fact(f"slot(0..{max_slot}).")
-                else:
-                    for sid in slot_ids:
-                        self.add_fact(f"slot({sid}).")
-
-        # Parse format (check for phased tournaments)
-        format_elem = root.find('.//Format')
-        if format_elem is not None:
-            game_mode_elem = format_elem.find('gameMode')
-            if game_mode_elem is not None and game_mode_elem.text == 'P':
-                self.add_fact("phased.")
-
-    def parse_ca1_constraints(self, root):
-        """Parse CA1 (Capacity) constraints."""
-        ca1_elements = root.findall('.//CA1')
-        for ca1 in ca1_elements:
-            constraint_id = self.get_constraint_id('ca1')
-            
-            # Basic parameters
-            constraint_type = ca1.get('type', 'HARD').lower()
-            max_val = ca1.get('max', '0')
-            min_val = ca1.get('min', '0')
-            mode = ca1.get('mode', 'H')
-            penalty = ca1.get('penalty', '1')
-            
-            self.add_fact(f'ca1_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'ca1_param({constraint_id}, max, {max_val}).')
-            self.add_fact(f'ca1_param({constraint_id}, min, {min_val}).')
-            self.add_fact(f'ca1_param({constraint_id}, mode, "{mode}").')
-            self.add_fact(f'ca1_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams
-            teams = self.parse_range(ca1.get('teams', ''))
-            for team in teams:
-                self.add_fact(f'ca1_teams({constraint_id}, {team}).')
-            
-            # Slots
-            slots = self.parse_list(ca1.get('slots', ''))
-            for slot in slots:
-                self.add_fact(f'ca1_slots({constraint_id}, {slot}).')
-
-    def parse_ca2_constraints(self, root):
-        """Parse CA2 (Capacity vs Opponent Set) constraints."""
-        ca2_elements = root.findall('.//CA2')
-        for ca2 in ca2_elements:
-            constraint_id = self.get_constraint_id('ca2')
-            
-            # Basic parameters
-            constraint_type = ca2.get('type', 'HARD').lower()
-            max_val = ca2.get('max', '0')
-            min_val = ca2.get('min', '0')
-            mode1 = ca2.get('mode1', 'H')
-            mode2 = ca2.get('mode2', 'GLOBAL')
-            penalty = ca2.get('penalty', '1')
-            
-            self.add_fact(f'ca2_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'ca2_param({constraint_id}, max, {max_val}).')
-            self.add_fact(f'ca2_param({constraint_id}, min, {min_val}).')
-            self.add_fact(f'ca2_param({constraint_id}, mode1, "{mode1}").')
-            self.add_fact(f'ca2_param({constraint_id}, mode2, "{mode2}").')
-            self.add_fact(f'ca2_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams1
-            teams1 = self.parse_range(ca2.get('teams1', ''))
-            for team in teams1:
-                self.add_fact(f'ca2_teams1({constraint_id}, {team}).')
-            
-            # Teams2
-            teams2 = self.parse_range(ca2.get('teams2', ''))
-            for team in teams2:
-                self.add_fact(f'ca2_teams2({constraint_id}, {team}).')
-            
-            # Slots
-            slots = self.parse_list(ca2.get('slots', ''))
-            for slot in slots:
-                self.add_fact(f'ca2_slots({constraint_id}, {slot}).')
-
-    def parse_ca3_constraints(self, root):
-        """Parse CA3 (Consecutive Games) constraints."""
-        ca3_elements = root.findall('.//CA3')
-        for ca3 in ca3_elements:
-            constraint_id = self.get_constraint_id('ca3')
-            
-            # Basic parameters
-            constraint_type = ca3.get('type', 'HARD').lower()
-            max_val = ca3.get('max', '0')
-            min_val = ca3.get('min', '0')
-            mode1 = ca3.get('mode1', 'H')
-            mode2 = ca3.get('mode2', 'SLOTS')
-            intp = ca3.get('intp', '1')
-            penalty = ca3.get('penalty', '1')
-            
-            self.add_fact(f'ca3_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'ca3_param({constraint_id}, max, {max_val}).')
-            self.add_fact(f'ca3_param({constraint_id}, min, {min_val}).')
-            self.add_fact(f'ca3_param({constraint_id}, mode1, "{mode1}").')
-            self.add_fact(f'ca3_param({constraint_id}, mode2, "{mode2}").')
-            self.add_fact(f'ca3_param({constraint_id}, intp, {intp}).')
-            self.add_fact(f'ca3_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams1
-            teams1 = self.parse_range(ca3.get('teams1', ''))
-            for team in teams1:
-                self.add_fact(f'ca3_teams1({constraint_id}, {team}).')
-            
-            # Teams2 (if present)
-            teams2 = self.parse_range(ca3.get('teams2', ''))
-            for team in teams2:
-                self.add_fact(f'ca3_teams2({constraint_id}, {team}).')
-
-    def parse_ca4_constraints(self, root):
-        """Parse CA4 (Group Capacity) constraints."""
-        ca4_elements = root.findall('.//CA4')
-        for ca4 in ca4_elements:
-            constraint_id = self.get_constraint_id('ca4')
-            
-            # Basic parameters
-            constraint_type = ca4.get('type', 'HARD').lower()
-            max_val = ca4.get('max', '0')
-            min_val = ca4.get('min', '0')
-            mode1 = ca4.get('mode1', 'H')
-            mode2 = ca4.get('mode2', 'GLOBAL')
-            penalty = ca4.get('penalty', '1')
-            
-            self.add_fact(f'ca4_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'ca4_param({constraint_id}, max, {max_val}).')
-            self.add_fact(f'ca4_param({constraint_id}, min, {min_val}).')
-            self.add_fact(f'ca4_param({constraint_id}, mode1, "{mode1}").')
-            self.add_fact(f'ca4_param({constraint_id}, mode2, "{mode2}").')
-            self.add_fact(f'ca4_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams1
-            teams1 = self.parse_range(ca4.get('teams1', ''))
-            for team in teams1:
-                self.add_fact(f'ca4_teams1({constraint_id}, {team}).')
-            
-            # Teams2
-            teams2 = self.parse_range(ca4.get('teams2', ''))
-            for team in teams2:
-                self.add_fact(f'ca4_teams2({constraint_id}, {team}).')
-            
-            # Slots
-            slots = self.parse_list(ca4.get('slots', ''))
-            for slot in slots:
-                self.add_fact(f'ca4_slots({constraint_id}, {slot}).')
-
-    def parse_ga1_constraints(self, root):
-        """Parse GA1 (Game Assignment) constraints."""
-        ga1_elements = root.findall('.//GA1')
-        for ga1 in ga1_elements:
-            constraint_id = self.get_constraint_id('ga1')
-            
-            # Basic parameters
-            constraint_type = ga1.get('type', 'HARD').lower()
-            max_val = ga1.get('max', '1')
-            min_val = ga1.get('min', '0')
-            penalty = ga1.get('penalty', '1')
-            
-            self.add_fact(f'ga1_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'ga1_param({constraint_id}, max, {max_val}).')
-            self.add_fact(f'ga1_param({constraint_id}, min, {min_val}).')
-            self.add_fact(f'ga1_param({constraint_id}, penalty, {penalty}).')
-            
-            # Meetings
-            meetings = self.parse_meetings(ga1.get('meetings', ''))
-            for t1, t2 in meetings:
-                self.add_fact(f'ga1_meetings({constraint_id}, {t1}, {t2}).')
-            
-            # Slots
-            slots = self.parse_list(ga1.get('slots', ''))
-            for slot in slots:
-                self.add_fact(f'ga1_slots({constraint_id}, {slot}).')
-
-    def parse_br1_constraints(self, root):
-        """Parse BR1 (Break per Team) constraints."""
-        br1_elements = root.findall('.//BR1')
-        for br1 in br1_elements:
-            constraint_id = self.get_constraint_id('br1')
-            
-            # Basic parameters
-            constraint_type = br1.get('type', 'HARD').lower()
-            intp = br1.get('intp', '0')
-            mode1 = br1.get('mode1', 'LEQ')
-            mode2 = br1.get('mode2', 'HA')
-            penalty = br1.get('penalty', '1')
-            
-            self.add_fact(f'br1_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'br1_param({constraint_id}, intp, {intp}).')
-            self.add_fact(f'br1_param({constraint_id}, mode1, "{mode1}").')
-            self.add_fact(f'br1_param({constraint_id}, mode2, "{mode2}").')
-            self.add_fact(f'br1_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams
-            teams = self.parse_range(br1.get('teams', ''))
-            for team in teams:
-                self.add_fact(f'br1_teams({constraint_id}, {team}).')
-            
-            # Slots
-            slots = self.parse_list(br1.get('slots', ''))
-            for slot in slots:
-                self.add_fact(f'br1_slots({constraint_id}, {slot}).')
-
-    def parse_br2_constraints(self, root):
-        """Parse BR2 (Global Break) constraints."""
-        br2_elements = root.findall('.//BR2')
-        for br2 in br2_elements:
-            constraint_id = self.get_constraint_id('br2')
-            
-            # Basic parameters
-            constraint_type = br2.get('type', 'HARD').lower()
-            intp = br2.get('intp', '0')
-            home_mode = br2.get('homeMode', 'HA')
-            mode2 = br2.get('mode2', 'LEQ')
-            penalty = br2.get('penalty', '1')
-            
-            self.add_fact(f'br2_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'br2_param({constraint_id}, intp, {intp}).')
-            self.add_fact(f'br2_param({constraint_id}, homeMode, "{home_mode}").')
-            self.add_fact(f'br2_param({constraint_id}, mode2, "{mode2}").')
-            self.add_fact(f'br2_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams
-            teams = self.parse_range(br2.get('teams', ''))
-            for team in teams:
-                self.add_fact(f'br2_teams({constraint_id}, {team}).')
-            
-            # Slots
-            slots = self.parse_range(br2.get('slots', ''))
-            for slot in slots:
-                self.add_fact(f'br2_slots({constraint_id}, {slot}).')
-
-    def parse_fa2_constraints(self, root):
-        """Parse FA2 (Fairness) constraints."""
-        fa2_elements = root.findall('.//FA2')
-        for fa2 in fa2_elements:
-            constraint_id = self.get_constraint_id('fa2')
-            
-            # Basic parameters
-            constraint_type = fa2.get('type', 'SOFT').lower()
-            intp = fa2.get('intp', '1')
-            penalty = fa2.get('penalty', '1')
-            
-            self.add_fact(f'fa2_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'fa2_param({constraint_id}, intp, {intp}).')
-            self.add_fact(f'fa2_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams
-            teams = self.parse_range(fa2.get('teams', ''))
-            for team in teams:
-                self.add_fact(f'fa2_teams({constraint_id}, {team}).')
-            
-            # Slots
-            slots = self.parse_range(fa2.get('slots', ''))
-            for slot in slots:
-                self.add_fact(f'fa2_slots({constraint_id}, {slot}).')
-
-    def parse_se1_constraints(self, root):
-        """Parse SE1 (Separation) constraints."""
-        se1_elements = root.findall('.//SE1')
-        for se1 in se1_elements:
-            constraint_id = self.get_constraint_id('se1')
-            
-            # Basic parameters
-            constraint_type = se1.get('type', 'SOFT').lower()
-            min_val = se1.get('min', '1')
-            penalty = se1.get('penalty', '1')
-            
-            self.add_fact(f'se1_param({constraint_id}, type, {constraint_type}).')
-            self.add_fact(f'se1_param({constraint_id}, min, {min_val}).')
-            self.add_fact(f'se1_param({constraint_id}, penalty, {penalty}).')
-            
-            # Teams
-            teams = self.parse_range(se1.get('teams', ''))
-            for team in teams:
-                self.add_fact(f'se1_teams({constraint_id}, {team}).')
+        num_ids = len(ids)
+        self.buf.write(f"num_{name}s({num_ids}).\n")
+        if min(ids) == 0 and max(ids) == num_ids - 1:
+            self.buf.write(f"{name}(0..{num_ids - 1}).\n")
+        else:
+            self.buf.write(''.join(f"{name}({i}).\n" for i in ids))
+
+    def parse_teams(self, teams: Any) -> None:
+        """Parse the Teams resource element."""
+        self.write_resource_ids('team', [int(team.get('id')) for team in teams.findall('team')])
+
+    def parse_slots(self, slots: Any) -> None:
+        """Parse the Slots resource element."""
+        self.write_resource_ids('slot', [int(slot.get('id')) for slot in slots.findall('slot')])
+
+    def parse_format(self, format_elem: Any) -> None:
+        """Parse the Format element (check for phased tournaments)."""
+        game_mode_elem = format_elem.find('gameMode')
+        if game_mode_elem is not None and game_mode_elem.text == 'P':
+            self.buf.write("phased.\n")
+
+    def parse_constraint(self, elem: Any) -> None:
+        """Parse a single constraint element as described by CONSTRAINT_SPECS."""
+        spec = CONSTRAINT_SPECS[elem.tag]
+        kind = elem.tag.lower()
+        constraint_id = next(self.constraint_ids[elem.tag])
+        
+        # Basic parameters
+        params = {**_PARAM_DEFAULTS[elem.tag], **elem.attrib}
+        params['type'] = params['type'].lower()
+        params['cid'] = constraint_id
+        self.buf.write(_PARAM_TMPLS[elem.tag].format_map(params))
+        
+        # Teams, slots and meetings
+        for attr, parser in spec['lists']:
+            text = elem.get(attr)
+            if not text:
+                # Optional attribute (e.g. teams2, meetings) is absent
+                continue
+            values = getattr(self, parser)(text)
+            if parser == 'parse_meetings':
+                self.buf.write(''.join(f'{kind}_{attr}({constraint_id}, {t1}, {t2}).\n' for t1, t2 in values))
+            elif attr == 'slots':
+                # Slot windows are mostly contiguous, so emit each run as a
+                # single interval fact and leave the expansion to the grounder
+                self.buf.write(''.join(
+                    f'{kind}_slots({constraint_id}, {a}..{b}).\n' if b > a else f'{kind}_slots({constraint_id}, {a}).\n'
+                    for a, b in _contig_runs(sorted(set(values)))))
+            else:
+                self.buf.write(''.join(f'{kind}_{attr}({constraint_id}, {value}).\n' for value in values))
 
-    def parse_xml_file(self, filename: str):
-        """Parse the XML file and generate ASP facts."""
+    def parse_xml_file(self, filename: str) -> None:
+        """Parse the XML file and generate ASP facts.
+
+        The file is streamed with iterparse in a single pass: each handled
+        element is dispatched on its tag, then cleared and detached from its
+        parent so the full DOM is never held in memory.
+        """
+        handlers = {
+            'Format': self.parse_format,
+            'Teams': self.parse_teams,
+            'Slots': self.parse_slots,
+        }
+        handlers.update(dict.fromkeys(CONSTRAINT_SPECS, self.parse_constraint))
+        
         try:
-            tree = ET.parse(filename)
-            root = tree.getroot()
-            
             # Add header comment
-            self.add_fact(f"% ASP facts generated from {filename}")
-            self.add_fact("")
-            
-            # Parse basic structure
-            self.add_fact("% Basic structure")
-            self.parse_basic_structure(root)
-            self.add_fact("")
-            
-            # Parse constraints
-            self.add_fact("% Constraints")
-            self.parse_ca1_constraints(root)
-            self.parse_ca2_constraints(root)
-            self.parse_ca3_constraints(root)
-            self.parse_ca4_constraints(root)
-            self.parse_ga1_constraints(root)
-            self.parse_br1_constraints(root)
-            self.parse_br2_constraints(root)
-            self.parse_fa2_constraints(root)
-            self.parse_se1_constraints(root)
+            self.buf.write(f"% ASP facts generated from {filename}\n\n")
+            
+            # Basic structure (Structure and Resources precede Constraints)
+            self.buf.write("% Basic structure\n")
+            
+            # Open elements, so handled ones can be detached from their parent
+            path = []
+            for event, elem in ET.iterparse(filename, events=('start', 'end')):
+                if event == 'start':
+                    path.append(elem)
+                    if elem.tag == 'Constraints':
+                        self.buf.write("\n% Constraints\n")
+                    continue
+                
+                path.pop()
+                handler = handlers.get(elem.tag)
+                if handler is not None:
+                    handler(elem)
+                    elem.clear()
+                    if path:
+                        path[-1].remove(elem)
             
         except ET.ParseError as e:
             print(f"Error parsing XML file: {e}", file=sys.stderr)
@@ -414,42 +259,66 @@ class ITC2021Parser:
             print(f"File not found: {filename}", file=sys.stderr)
             sys.exit(1)
 
-    def write_facts(self, filename: str):
+    def write_facts(self, filename: str) -> None:
         """Write the generated facts to a file."""
         try:
             with open(filename, 'w') as f:
-                for fact in self.facts:
-                    f.write(fact + '\n')
+                f.write(self.buf.getvalue())
         except IOError as e:
             print(f"Error writing to file: {e}", file=sys.stderr)
             sys.exit(1)
 
 
-def main():
+def convert_files(jobs: List[Tuple[str, str]], verbose: bool = False) -> None:
+    """Convert each (input XML, output facts) pair with a single parser.
+
+    The parser and its output buffer are reused between files, so a batch
+    pays the interpreter and XML library start-up cost only once.
+    """
+    itc_parser = ITC2021Parser()
+    
+    for input_file, output_file in jobs:
+        itc_parser.reset()
+        
+        if verbose:
+            print(f"Parsing {input_file}...")
+        
+        # Parse XML file
+        itc_parser.parse_xml_file(input_file)
+        
+        if verbose:
+            num_facts = itc_parser.buf.getvalue().count('\n')
+            print(f"Generated {num_facts} facts")
+        
+        # Write output
+        itc_parser.write_facts(output_file)
+        
+        if verbose:
+            print(f"ASP facts written to {output_file}")
+
+
+def main() -> None:
     parser = argparse.ArgumentParser(description='Convert ITC2021 XML to ASP facts')
-    parser.add_argument('input', help='Input XML file')
-    parser.add_argument('output', help='Output ASP facts file')
+    parser.add_argument('input', help='Input XML file (directory with --batch)')
+    parser.add_argument('output', help='Output ASP facts file (directory with --batch)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Convert every .xml in the input directory to <name>.lp in the output directory')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     
     args = parser.parse_args()
     
-    # Create parser instance
-    itc_parser = ITC2021Parser()
-    
-    if args.verbose:
-        print(f"Parsing {args.input}...")
-    
-    # Parse XML file
-    itc_parser.parse_xml_file(args.input)
-    
-    if args.verbose:
-        print(f"Generated {len(itc_parser.facts)} facts")
-    
-    # Write output
-    itc_parser.write_facts(args.output)
+    if args.batch:
+        input_files = sorted(glob.glob(os.path.join(args.input, '*.xml')))
+        if not input_files:
+            print(f"No .xml files found in {args.input}", file=sys.stderr)
+            sys.exit(1)
+        os.makedirs(args.output, exist_ok=True)
+        jobs = [(f, os.path.join(args.output, os.path.splitext(os.path.basename(f))[0] + '.lp'))
+                for f in input_files]
+    else:
+        jobs = [(args.input, args.output)]
     
-    if args.verbose:
-        print(f"ASP facts written to {args.output}")
+    convert_files(jobs, args.verbose)
 
 
 if __name__ == "__main__":
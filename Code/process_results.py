@@ -3,22 +3,75 @@
 Process Clingo JSON output files to extract schedules and optimization values.
 """
 
+import io
 import json
 import glob
 import sys
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-def process_clingo_json(json_file):
-    """Process a single Clingo JSON output file."""
+# orjson parses in C and is much faster; fall back to the stdlib parser
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# ijson streams a document event by event; only used for summary-only runs
+try:
+    import ijson
+    _DECODE_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _DECODE_ERRORS = (json.JSONDecodeError,)
+
+def load_summary_fields(f):
+    """Stream only the summary fields of a Clingo JSON file with ijson.
+
+    Returns a dict shaped like the full document but holding just Result,
+    Time.Total and the Costs of the last model, so the large Value atom
+    lists are never materialized.
+    """
+    data = {}
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix == 'Result' and event == 'string':
+            data['Result'] = value
+        elif prefix == 'Time.Total' and event == 'number':
+            data['Time'] = {'Total': value}
+        elif prefix == 'Models.item' and event == 'start_map':
+            last_model = {'Costs': []}
+            data['Models'] = [last_model]
+        elif prefix == 'Models.item.Costs.item' and event == 'number':
+            last_model['Costs'].append(value)
+    return data
+
+def process_clingo_json(json_file, need_schedule=True):
+    """Process a single Clingo JSON output file.
+
+    With need_schedule=False (and ijson installed) only the summary fields
+    are streamed from the file and 'schedule' is left as None.
+    """
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError) as e:
+        with open(json_file, 'rb') as f:
+            if need_schedule or ijson is None:
+                data = json_loads(f.read())
+            else:
+                data = load_summary_fields(f)
+    except _DECODE_ERRORS + (FileNotFoundError,) as e:
         print(f"Error reading {json_file}: {e}")
         return None
     
+    # Test number from the file name, e.g. path/to/test12.json -> 12
+    base = os.path.basename(json_file)
+    if base.startswith('test') and base.endswith('.json'):
+        test_num = base[4:-5]
+    else:
+        test_num = base
+    
     result = {
         'file': json_file,
+        'test_num': test_num,
         'status': 'UNKNOWN',
         'optimization_value': None,
         'schedule': None,
@@ -43,61 +96,65 @@ def process_clingo_json(json_file):
         
         # Extract schedule facts
         if 'Value' in last_model:
-            schedule_facts = []
-            for atom in last_model['Value']:
-                if atom.startswith('schedule('):
-                    schedule_facts.append(atom)
-            result['schedule'] = schedule_facts
+            result['schedule'] = [atom for atom in last_model['Value'] if atom[:9] == 'schedule(']
     
     return result
 
 def print_summary_table(results):
     """Print a summary table of all results."""
-    print("\nSUMMARY TABLE")
-    print("=" * 80)
-    print(f"{'Test':<6} {'Status':<15} {'Opt Value':<12} {'Schedule Size':<15} {'Time (s)':<10}")
-    print("-" * 80)
+    buf = io.StringIO()
+    buf.write("\nSUMMARY TABLE\n")
+    buf.write("=" * 80 + "\n")
+    buf.write(f"{'Test':<6} {'Status':<15} {'Opt Value':<12} {'Schedule Size':<15} {'Time (s)':<10}\n")
+    buf.write("-" * 80 + "\n")
     
     for result in results:
         if result is None:
             continue
             
-        # Extract test number from filename
-        test_num = result['file'].replace('test', '').replace('.json', '')
-        
+        test_num = result['test_num']
         status = result['status']
         opt_val = result['optimization_value'] if result['optimization_value'] is not None else "N/A"
         schedule_size = len(result['schedule']) if result['schedule'] else "N/A"
         time_val = f"{result['solve_time']:.2f}" if result['solve_time'] is not None else "N/A"
         
-        print(f"{test_num:<6} {status:<15} {opt_val:<12} {schedule_size:<15} {time_val:<10}")
+        buf.write(f"{test_num:<6} {status:<15} {opt_val:<12} {schedule_size:<15} {time_val:<10}\n")
+    
+    sys.stdout.write(buf.getvalue())
 
 def save_detailed_results(results, output_file='detailed_results.txt'):
     """Save detailed results to a text file."""
-    with open(output_file, 'w') as f:
-        f.write("DETAILED CLINGO RESULTS\n")
-        f.write("=" * 50 + "\n\n")
-        
-        for result in results:
-            if result is None:
-                continue
-                
-            test_num = result['file'].replace('test', '').replace('.json', '')
-            f.write(f"TEST {test_num}\n")
-            f.write(f"Status: {result['status']}\n")
-            f.write(f"Optimization Value: {result['optimization_value']}\n")
-            f.write(f"Solve Time: {result['solve_time']} seconds\n")
-            
-            if result['schedule']:
-                f.write(f"Schedule ({len(result['schedule'])} games):\n")
-                for fact in sorted(result['schedule']):
-                    f.write(f"  {fact}\n")
-            else:
-                f.write("No schedule found\n")
+    # Build the whole report in memory and write it with a single call
+    buf = io.StringIO()
+    buf.write("DETAILED CLINGO RESULTS\n")
+    buf.write("=" * 50 + "\n\n")
+    
+    for result in results:
+        if result is None:
+            continue
             
-            f.write("\n" + "-" * 50 + "\n\n")
+        buf.write(f"TEST {result['test_num']}\n")
+        buf.write(f"Status: {result['status']}\n")
+        buf.write(f"Optimization Value: {result['optimization_value']}\n")
+        buf.write(f"Solve Time: {result['solve_time']} seconds\n")
+        
+        if result['schedule']:
+            buf.write(f"Schedule ({len(result['schedule'])} games):\n")
+            buf.write(''.join(f"  {fact}\n" for fact in sorted(result['schedule'])))
+        else:
+            buf.write("No schedule found\n")
+        
+        buf.write("\n" + "-" * 50 + "\n\n")
+    
+    with open(output_file, 'w') as f:
+        f.write(buf.getvalue())
 
 def main():
+    parser = argparse.ArgumentParser(description='Summarize Clingo JSON output files')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Only print the summary table; skip schedules and detailed_results.txt')
+    args = parser.parse_args()
+    
     # Find all test JSON files
     json_files = sorted(glob.glob('test*.json'))
     
@@ -107,18 +164,18 @@ def main():
     
     print(f"Processing {len(json_files)} JSON files...")
     
-    results = []
-    for json_file in json_files:
-        print(f"Processing {json_file}...")
-        result = process_clingo_json(json_file)
-        results.append(result)
+    # Files are independent, so read and parse them concurrently
+    with ThreadPoolExecutor(max_workers=min(32, len(json_files))) as executor:
+        process = partial(process_clingo_json, need_schedule=not args.summary_only)
+        results = list(executor.map(process, json_files))
     
     # Print summary
     print_summary_table(results)
     
     # Save detailed results
-    save_detailed_results(results)
-    print(f"\nDetailed results saved to 'detailed_results.txt'")
+    if not args.summary_only:
+        save_detailed_results(results)
+        print(f"\nDetailed results saved to 'detailed_results.txt'")
     
     # Print quick stats
     successful = sum(1 for r in results if r and r['status'] == 'SATISFIABLE')
@@ -6,160 +6,197 @@ Analyzes ASP results, compares with reference bounds, and generates detailed CSV
 
 import pandas as pd
 import numpy as np
-import json
 import os
 import re
+import hashlib
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from result_files import iter_json, read_bytes
+
+# orjson parses in C and is much faster; fall back to the stdlib parser
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+_KEY_RE = re.compile(r'([a-z]+\d+)_(.+)')
+
+# pyarrow enables the multithreaded CSV reader and the Parquet results cache
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+_REF_COLUMNS = {
+    'lower_bound': 'ref_lower_bound',
+    'upper_bound': 'ref_upper_bound',
+    'instance_name': 'ref_instance_name',
+}
 
 def load_reference_bounds(bounds_file="reference_bounds.csv"):
-    """Load reference bounds data"""
+    """Load reference bounds data, one row per instance_key with ref_* columns"""
     try:
-        bounds_df = pd.read_csv(bounds_file)
-        # Create a lookup dictionary for quick access
-        bounds_lookup = {}
-        for _, row in bounds_df.iterrows():
-            instance_key = row['instance_key']
-            bounds_lookup[instance_key] = {
-                'lower_bound': row['lower_bound'] if pd.notna(row['lower_bound']) else None,
-                'upper_bound': row['upper_bound'] if pd.notna(row['upper_bound']) else None,
-                'instance_name': row['instance_name']
-            }
-        return bounds_lookup
+        # The pyarrow engine parses multithreaded when pyarrow is installed
+        engine = 'c' if pa is None else 'pyarrow'
+        bounds_df = pd.read_csv(bounds_file, usecols=['instance_key', *_REF_COLUMNS], engine=engine)
+        return bounds_df.rename(columns=_REF_COLUMNS)
     except Exception as e:
         print(f"Error loading bounds file: {e}")
-        return {}
+        return pd.DataFrame(columns=['instance_key', *_REF_COLUMNS.values()])
 
 def extract_instance_key(filename):
     """Extract standardized instance key from JSON filename
     e.g., early12_BB2.json -> early12
     """
     base = filename.replace('.json', '')
-    match = re.match(r'([a-z]+\d+)_(.+)', base)
+    match = _KEY_RE.match(base)
     if match:
         return match.group(1), match.group(2)  # instance_key, config
     return None, None
 
+def _parse_one(json_file):
+    """Extract the result row for a single JSON file (None if unusable)"""
+    try:
+        data = json_loads(read_bytes(json_file))
+        
+        filename = os.path.basename(json_file)
+        instance_key, config = extract_instance_key(filename)
+        
+        if not instance_key or not config:
+            print(f"Could not parse filename: {filename}")
+            return None
+        
+        # Extract basic information
+        result = data.get("Result", "UNKNOWN")
+        total_time = data.get("Time", {}).get("Total")
+        solve_time = data.get("Time", {}).get("Solve")
+        cpu_time = data.get("Time", {}).get("CPU")
+        threads = data.get("Threads")
+        
+        # Initialize solution-specific fields
+        cost = None
+        lower_bound_solver = None
+        upper_bound_solver = None
+        models_found = data.get("Models", {}).get("Number", 0)
+        is_optimal = data.get("Models", {}).get("Optimum") == "yes"
+        
+        # Extract solution data if available
+        if result in ["SATISFIABLE", "OPTIMUM FOUND"]:
+            calls = data.get("Call", [])
+            if calls and "Witnesses" in calls[0]:
+                witnesses = calls[0]["Witnesses"]
+                if witnesses:
+                    # Get best witness (first one, as they're usually sorted by cost)
+                    best_witness = witnesses[0]
+                    
+                    # Extract cost
+                    costs = best_witness.get("Costs", [])
+                    if costs:
+                        cost = costs[0]
+            
+            # Check for bounds in the JSON (some results have bounds)
+            bounds = data.get("Bounds", {})
+            if bounds:
+                if bounds.get("Lower") and len(bounds.get("Lower", [])) > 0:
+                    lower_bound_solver = bounds["Lower"][0]
+                if bounds.get("Upper") and len(bounds.get("Upper", [])) > 0:
+                    upper_bound_solver = bounds["Upper"][0]
+        
+        return {
+            'filename': filename,
+            'instance_key': instance_key,
+            'configuration': config,
+            'result': result,
+            'cost': cost,
+            'lower_bound_solver': lower_bound_solver,
+            'upper_bound_solver': upper_bound_solver,
+            'total_time': total_time,
+            'solve_time': solve_time,
+            'cpu_time': cpu_time,
+            'threads': threads,
+            'models_found': models_found,
+            'is_optimal': is_optimal
+        }
+        
+    except Exception as e:
+        print(f"Error processing {json_file}: {e}")
+        return None
+
 def process_json_results(results_dir="Results/main_exp"):
     """Process all JSON results and extract data"""
-    results = []
-    
     # Find all JSON files
-    json_files = []
-    for root, dirs, files in os.walk(results_dir):
-        for file in files:
-            if file.endswith('.json'):
-                json_files.append(os.path.join(root, file))
+    json_files = list(iter_json(results_dir))
     
     print(f"Processing {len(json_files)} JSON result files...")
     
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-            
-            filename = os.path.basename(json_file)
-            instance_key, config = extract_instance_key(filename)
-            
-            if not instance_key or not config:
-                print(f"Could not parse filename: {filename}")
-                continue
-            
-            # Extract basic information
-            result = data.get("Result", "UNKNOWN")
-            total_time = data.get("Time", {}).get("Total")
-            solve_time = data.get("Time", {}).get("Solve")
-            cpu_time = data.get("Time", {}).get("CPU")
-            threads = data.get("Threads")
-            
-            # Initialize solution-specific fields
-            cost = None
-            lower_bound_solver = None
-            upper_bound_solver = None
-            models_found = data.get("Models", {}).get("Number", 0)
-            is_optimal = data.get("Models", {}).get("Optimum") == "yes"
-            
-            # Extract solution data if available
-            if result in ["SATISFIABLE", "OPTIMUM FOUND"]:
-                calls = data.get("Call", [])
-                if calls and "Witnesses" in calls[0]:
-                    witnesses = calls[0]["Witnesses"]
-                    if witnesses:
-                        # Get best witness (first one, as they're usually sorted by cost)
-                        best_witness = witnesses[0]
-                        
-                        # Extract cost
-                        costs = best_witness.get("Costs", [])
-                        if costs:
-                            cost = costs[0]
-                
-                # Check for bounds in the JSON (some results have bounds)
-                bounds = data.get("Bounds", {})
-                if bounds:
-                    if bounds.get("Lower") and len(bounds.get("Lower", [])) > 0:
-                        lower_bound_solver = bounds["Lower"][0]
-                    if bounds.get("Upper") and len(bounds.get("Upper", [])) > 0:
-                        upper_bound_solver = bounds["Upper"][0]
-            
-            results.append({
-                'filename': filename,
-                'instance_key': instance_key,
-                'configuration': config,
-                'result': result,
-                'cost': cost,
-                'lower_bound_solver': lower_bound_solver,
-                'upper_bound_solver': upper_bound_solver,
-                'total_time': total_time,
-                'solve_time': solve_time,
-                'cpu_time': cpu_time,
-                'threads': threads,
-                'models_found': models_found,
-                'is_optimal': is_optimal
-            })
-            
-        except Exception as e:
-            print(f"Error processing {json_file}: {e}")
+    # Files are independent, so parse them across worker processes
+    with ProcessPoolExecutor() as executor:
+        results = [r for r in executor.map(_parse_one, json_files, chunksize=32) if r]
     
-    return pd.DataFrame(results)
+    results_df = pd.DataFrame(results)
+    if results_df.empty:
+        return results_df
+    
+    # Counts are small ints; the nullable types keep a missing value as <NA>.
+    # Costs and times stay float64 since they feed gaps and reported times.
+    return results_df.astype({'models_found': 'Int32', 'threads': 'Int16'})
+
+CACHE_DIR = ".cache"
 
-def calculate_analysis_metrics(results_df, bounds_lookup):
+def _results_signature(results_dir):
+    """Digest over (path, mtime, size) of every result file and this script"""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted([__file__, *iter_json(results_dir)]):
+        st = os.stat(path)
+        digest.update(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode())
+    return digest.hexdigest()
+
+def load_results(results_dir="Results/main_exp"):
+    """process_json_results, reusing a Parquet cache while the inputs are unchanged
+    (only with pyarrow installed; otherwise the JSON files are always parsed)
+    """
+    if pa is None:
+        return process_json_results(results_dir)
+    
+    cache_file = os.path.join(CACHE_DIR, f"results_{_results_signature(results_dir)}.parquet")
+    if os.path.exists(cache_file):
+        print(f"Using cached results from {cache_file}")
+        return pd.read_parquet(cache_file)
+    
+    results_df = process_json_results(results_dir)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        results_df.to_parquet(cache_file, index=False)
+    except Exception as e:
+        print(f"Could not cache results: {e}")
+    return results_df
+
+def calculate_analysis_metrics(results_df, bounds_df):
     """Calculate analysis metrics including gaps and rankings"""
     
-    # Add reference bounds
-    results_df['ref_lower_bound'] = results_df['instance_key'].map(
-        lambda x: bounds_lookup.get(x, {}).get('lower_bound')
-    )
-    results_df['ref_upper_bound'] = results_df['instance_key'].map(
-        lambda x: bounds_lookup.get(x, {}).get('upper_bound')
-    )
-    results_df['ref_instance_name'] = results_df['instance_key'].map(
-        lambda x: bounds_lookup.get(x, {}).get('instance_name', 'Unknown')
-    )
-    
-    # Calculate gaps
-    def calculate_gap(row):
-        if pd.isna(row['cost']) or pd.isna(row['ref_lower_bound']):
-            return None
-        if row['ref_lower_bound'] == 0:
-            return row['cost']  # When lower bound is 0, gap is just the cost
-        return ((row['cost'] - row['ref_lower_bound']) / row['ref_lower_bound']) * 100
+    # Add reference bounds with a single join on instance_key
+    results_df = results_df.merge(bounds_df, on='instance_key', how='left')
+    results_df['ref_instance_name'] = results_df['ref_instance_name'].fillna('Unknown')
     
-    results_df['gap_percent'] = results_df.apply(calculate_gap, axis=1)
+    # Calculate gaps on whole columns; NaN cost or bound propagates to NaN
+    cost = results_df['cost'].to_numpy(dtype=float)
+    lb = results_df['ref_lower_bound'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # When lower bound is 0, gap is just the cost
+        results_df['gap_percent'] = np.where(lb == 0, cost, (cost - lb) / lb * 100)
     
-    # Add instance category (early, late, middle)
-    results_df['instance_category'] = results_df['instance_key'].str.extract(r'([a-z]+)')[0]
-    results_df['instance_number'] = results_df['instance_key'].str.extract(r'([a-z]+)(\d+)')[1].astype(int)
+    # Add instance category (early, late, middle) and number in one regex pass
+    key_parts = results_df['instance_key'].str.extract(r'([a-z]+)(\d+)')
+    results_df['instance_category'] = key_parts[0]
+    results_df['instance_number'] = key_parts[1].astype('int32')
     
     # Calculate rankings per instance
     results_df['rank_by_instance'] = results_df.groupby('instance_key')['cost'].rank(method='min', na_option='bottom')
     
-    # Find best configuration per instance
-    def get_best_config(group):
-        valid_costs = group.dropna(subset=['cost'])
-        if valid_costs.empty:
-            return None
-        return valid_costs.loc[valid_costs['cost'].idxmin(), 'configuration']
-    
-    best_configs = results_df.groupby('instance_key').apply(get_best_config)
+    # Find best configuration per instance (instances without any cost get none)
+    best_idx = results_df.dropna(subset=['cost']).groupby('instance_key')['cost'].idxmin()
+    best_configs = results_df.loc[best_idx].set_index('instance_key')['configuration']
     results_df['best_config_for_instance'] = results_df['instance_key'].map(best_configs)
     results_df['is_best_config'] = results_df['configuration'] == results_df['best_config_for_instance']
     
@@ -170,22 +207,21 @@ def generate_summary_stats(results_df):
     summary = {}
     
     # Overall statistics
-    summary['total_instances'] = len(results_df['instance_key'].unique())
-    summary['total_configurations'] = len(results_df['configuration'].unique())
+    summary['total_instances'] = results_df['instance_key'].nunique()
+    summary['total_configurations'] = results_df['configuration'].nunique()
     summary['total_runs'] = len(results_df)
     
     # Results by status
     status_counts = results_df['result'].value_counts().to_dict()
     summary['results_by_status'] = status_counts
     
-    # Solutions found
-    solutions_found = results_df[results_df['cost'].notna()]
-    summary['solutions_found'] = len(solutions_found)
-    summary['solution_rate'] = len(solutions_found) / len(results_df) * 100
+    # Solutions found (counted from the mask, without copying the rows out)
+    solutions_found = int(results_df['cost'].notna().sum())
+    summary['solutions_found'] = solutions_found
+    summary['solution_rate'] = solutions_found / len(results_df) * 100
     
     # Optimal solutions
-    optimal_solutions = results_df[results_df['is_optimal'] == True]
-    summary['optimal_solutions'] = len(optimal_solutions)
+    summary['optimal_solutions'] = int(results_df['is_optimal'].eq(True).sum())
     
     # Performance by configuration
     config_performance = results_df.groupby('configuration').agg({
@@ -270,17 +306,17 @@ def main():
     
     # Load reference bounds
     print("Loading reference bounds...")
-    bounds_lookup = load_reference_bounds()
-    print(f"Loaded bounds for {len(bounds_lookup)} instances")
+    bounds_df = load_reference_bounds()
+    print(f"Loaded bounds for {len(bounds_df)} instances")
     
     # Process JSON results
     print("Processing JSON results...")
-    results_df = process_json_results()
+    results_df = load_results()
     print(f"Processed {len(results_df)} result entries")
     
     # Calculate analysis metrics
     print("Calculating analysis metrics...")
-    results_df = calculate_analysis_metrics(results_df, bounds_lookup)
+    results_df = calculate_analysis_metrics(results_df, bounds_df)
     
     # Generate summary statistics
     summary = generate_summary_stats(results_df)
@@ -4,17 +4,30 @@ Convert ASP solver results to ITC 2021 XML format
 Parses JSON files with schedule(home, away, slot) atoms and generates XML solutions
 """
 
-import json
 import os
 import re
+import numpy as np
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import itemgetter
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+
+from result_files import iter_json, read_bytes
+
+# orjson parses in C and is much faster; fall back to the stdlib parser
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+_SCHEDULE_RE = re.compile(r'schedule\((\d+),(\d+),(\d+)\)')
+_INSTANCE_RE = re.compile(r'([a-z]+)(\d+)_(.+)')
 
 def parse_schedule_atom(atom_str):
     """Parse a schedule atom string like 'schedule(1,4,0)' to extract home, away, slot"""
-    match = re.match(r'schedule\((\d+),(\d+),(\d+)\)', atom_str.strip())
+    match = _SCHEDULE_RE.match(atom_str.strip())
     if match:
         home = int(match.group(1))
         away = int(match.group(2))
@@ -29,7 +42,7 @@ def extract_instance_info(filename):
     base = filename.replace('.json', '')
     
     # Match pattern like early12_BB2 or middle5_USC15-CR
-    match = re.match(r'([a-z]+)(\d+)_(.+)', base)
+    match = _INSTANCE_RE.match(base)
     if match:
         category = match.group(1)
         number = int(match.group(2))
@@ -38,15 +51,15 @@ def extract_instance_info(filename):
     
     return None
 
+_SOLUTION_HEAD = b'<?xml version="1.0" encoding="UTF-8"?>\n<Solution>\n  '
+_MATCH_TMPL = '    <ScheduledMatch home="{}" away="{}" slot="{}" />\n'
+
 def create_xml_solution(instance_info, schedule_data, cost=None, is_optimal=False):
-    """Create XML solution document"""
+    """Create the pretty-printed XML solution document as UTF-8 bytes"""
     category, number, config = instance_info
     
-    # Create root element
-    root = ET.Element("Solution")
-    
     # Create MetaData section - minimal format like working examples
-    metadata = ET.SubElement(root, "MetaData")
+    metadata = ET.Element("MetaData")
     
     # Instance name: Use format from working examples
     instance_name = ET.SubElement(metadata, "InstanceName")
@@ -76,33 +89,28 @@ def create_xml_solution(instance_info, schedule_data, cost=None, is_optimal=Fals
     date.set("month", str(now.month))
     date.set("year", str(now.year))
     
-    # Create Games section
-    games = ET.SubElement(root, "Games")
-    
-    # Add scheduled matches
-    if schedule_data:
-        # Sort by slot for consistent output
-        sorted_schedule = sorted(schedule_data, key=lambda x: x[2])
-        
-        for home, away, slot in sorted_schedule:
-            match = ET.SubElement(games, "ScheduledMatch")
-            match.set("home", str(home))
-            match.set("away", str(away))
-            match.set("slot", str(slot))
+    # MetaData is small, so ET serializes it, indented as a child of Solution
+    ET.indent(metadata, space="  ", level=1)
+    parts = [_SOLUTION_HEAD, ET.tostring(metadata, encoding='utf-8'), b'\n']
+    
+    # Create Games section; one fixed-shape line per match, so it is
+    # formatted directly instead of building an Element per match
+    schedule_data = np.asarray(schedule_data, dtype=np.int32).reshape(-1, 3)
+    if len(schedule_data):
+        # Sort by slot for consistent output (stable, so ties keep atom order)
+        sorted_schedule = schedule_data[np.argsort(schedule_data[:, 2], kind='stable')].tolist()
+        games = ''.join([_MATCH_TMPL.format(home, away, slot) for home, away, slot in sorted_schedule])
+        parts += [b'  <Games>\n', games.encode(), b'  </Games>\n']
+    else:
+        parts.append(b'  <Games />\n')
     
-    return root
-
-def prettify_xml(elem):
-    """Return a pretty-printed XML string for the Element."""
-    rough_string = ET.tostring(elem, 'unicode')
-    reparsed = minidom.parseString(rough_string)
-    return reparsed.toprettyxml(indent="  ").replace('<?xml version="1.0" ?>', '<?xml version="1.0" encoding="UTF-8"?>')
+    parts.append(b'</Solution>\n')
+    return b''.join(parts)
 
 def process_json_file(filepath):
     """Process a single JSON file and extract solution data"""
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        data = json_loads(read_bytes(filepath))
         
         # Extract instance info from filename
         filename = os.path.basename(filepath)
@@ -126,27 +134,26 @@ def process_json_file(filepath):
             if calls:
                 witnesses = calls[0].get("Witnesses", [])
                 if witnesses:
-                    # Find the witness with the minimum cost (best solution)
-                    best_witness = None
-                    best_cost = float('inf')
-                    
-                    for witness in witnesses:
-                        witness_costs = witness.get("Costs", [])
-                        if witness_costs:
-                            witness_cost = witness_costs[0]
-                            if witness_cost < best_cost:
-                                best_cost = witness_cost
-                                best_witness = witness
-                    
-                    if best_witness:
-                        cost = best_cost
+                    # Find the witness with the minimum cost (best solution);
+                    # min keeps the first of equally good witnesses
+                    scored = [(w["Costs"][0], w) for w in witnesses if w.get("Costs")]
+                    if scored:
+                        cost, best_witness = min(scored, key=itemgetter(0))
                         # Extract schedule from the best witness
                         values = best_witness.get("Value", [])
                         for atom in values:
                             if atom.startswith("schedule("):
-                                parsed = parse_schedule_atom(atom)
-                                if parsed:
-                                    schedule_data.append(parsed)
+                                # Fast path: slice off 'schedule(' and ')' and split
+                                try:
+                                    home, away, slot = atom[9:-1].split(",")
+                                    schedule_data.append((int(home), int(away), int(slot)))
+                                except ValueError:
+                                    parsed = parse_schedule_atom(atom)
+                                    if parsed:
+                                        schedule_data.append(parsed)
+        
+        # One C-level conversion to an (n, 3) int32 array of home, away, slot
+        schedule_data = np.array(schedule_data, dtype=np.int32).reshape(-1, 3)
         
         return {
             'instance_info': instance_info,
@@ -168,12 +175,12 @@ def convert_json_to_xml(json_file, output_dir):
         return False
     
     # Skip instances where no solution was found (empty schedule)
-    if not solution_data['schedule_data']:
+    if not len(solution_data['schedule_data']):
         print(f"Skipping {solution_data['filename']} - no solution found")
         return False
     
     # Create XML
-    xml_root = create_xml_solution(
+    xml_bytes = create_xml_solution(
         solution_data['instance_info'],
         solution_data['schedule_data'],
         solution_data['cost'],
@@ -186,12 +193,20 @@ def convert_json_to_xml(json_file, output_dir):
     output_path = os.path.join(output_dir, xml_filename)
     
     # Write XML file
-    xml_string = prettify_xml(xml_root)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(xml_string)
+    with open(output_path, 'wb') as f:
+        f.write(xml_bytes)
     
     return True
 
+def _convert_one(json_file, output_dir):
+    """Worker wrapper around convert_json_to_xml that never raises"""
+    print(f"Processing: {os.path.basename(json_file)}")
+    try:
+        return convert_json_to_xml(json_file, output_dir)
+    except Exception as e:
+        print(f"Failed to process {json_file}: {e}")
+        return False
+
 def convert_all_results(input_dir="Results/main_exp", 
                        output_dir="xml_solutions"):
     """Convert all JSON results to XML format"""
@@ -200,28 +215,16 @@ def convert_all_results(input_dir="Results/main_exp",
     os.makedirs(output_dir, exist_ok=True)
     
     # Find all JSON files
-    json_files = []
-    for root, dirs, files in os.walk(input_dir):
-        for file in files:
-            if file.endswith('.json'):
-                json_files.append(os.path.join(root, file))
+    json_files = list(iter_json(input_dir))
     
     print(f"Found {len(json_files)} JSON files to process")
     
-    # Process each file
-    successful = 0
-    failed = 0
-    
-    for json_file in json_files:
-        print(f"Processing: {os.path.basename(json_file)}")
-        try:
-            if convert_json_to_xml(json_file, output_dir):
-                successful += 1
-            else:
-                failed += 1
-        except Exception as e:
-            print(f"Failed to process {json_file}: {e}")
-            failed += 1
+    # Files are independent, so convert them across worker processes
+    with ProcessPoolExecutor() as executor:
+        converted = list(executor.map(_convert_one, json_files, repeat(output_dir), chunksize=32))
+    
+    successful = sum(converted)
+    failed = len(converted) - successful
     
     print(f"\nConversion complete!")
     print(f"Successful: {successful}")
@@ -4,32 +4,50 @@ Extract reference bounds from RobinX ITC2021 repository
 Parses XML bound files and creates CSV lookup table for analysis
 """
 
-import xml.etree.ElementTree as ET
 import pandas as pd
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import re
 
+# lxml parses in libxml2 (releasing the GIL); fall back to the stdlib parser
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+_BOUND_RE = re.compile(r'ITC2021_(\w+)_(\d+)')
+
 def parse_bound_file(filepath):
     """Parse a single bound XML file and extract bounds data"""
     try:
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        # Extract instance name from metadata
-        instance_name = root.find('.//InstanceName').text
-        
-        # Extract bounds
+        instance_name = None
+        found_name = False
         lower_bound = None
         upper_bound = None
         
-        lower_elem = root.find('.//LowerBound/Objective')
-        if lower_elem is not None:
-            lower_bound = float(lower_elem.text)
+        # Single streaming pass; path holds the tags of the open ancestors
+        path = []
+        for event, elem in ET.iterparse(str(filepath), events=('start', 'end')):
+            if event == 'start':
+                path.append(elem.tag)
+                continue
             
-        upper_elem = root.find('.//UpperBound/Objective')
-        if upper_elem is not None:
-            upper_bound = float(upper_elem.text)
+            path.pop()
+            if elem.tag == 'InstanceName':
+                # Instance name from metadata (first occurrence)
+                if not found_name:
+                    instance_name = elem.text
+                    found_name = True
+            elif elem.tag == 'Objective' and path:
+                # Bounds are the Objective children of LowerBound/UpperBound
+                if path[-1] == 'LowerBound' and lower_bound is None:
+                    lower_bound = float(elem.text)
+                elif path[-1] == 'UpperBound' and upper_bound is None:
+                    upper_bound = float(elem.text)
+        
+        if not found_name:
+            raise ValueError("no InstanceName element")
         
         return {
             'instance_name': instance_name,
@@ -49,7 +67,7 @@ def extract_instance_key(filename):
     base = filename.replace('.xml', '').replace('_Bound', '')
     
     # Extract parts using regex
-    match = re.match(r'ITC2021_(\w+)_(\d+)', base)
+    match = _BOUND_RE.match(base)
     if match:
         category = match.group(1).lower()
         number = int(match.group(2))
@@ -72,8 +90,11 @@ def extract_all_bounds(bounds_dir="Validation/RobinX/Repository/ITC2021/Bounds/"
     xml_files = list(bounds_path.glob("*.xml"))
     print(f"Found {len(xml_files)} XML files")
     
-    for filepath in xml_files:
-        bound_data = parse_bound_file(filepath)
+    # Parse the files concurrently; results come back in input order
+    with ThreadPoolExecutor(max_workers=min(32, len(xml_files) or 1)) as executor:
+        parsed = list(executor.map(parse_bound_file, xml_files))
+    
+    for filepath, bound_data in zip(xml_files, parsed):
         if bound_data:
             # Extract standardized instance key
             instance_key = extract_instance_key(filepath.name)
@@ -92,33 +113,15 @@ def extract_all_bounds(bounds_dir="Validation/RobinX/Repository/ITC2021/Bounds/"
     print(f"Extracted {len(df)} bound entries")
     print(f"Unique instances: {len(df['instance_key'].unique())}")
     
-    # For each instance, take the minimum lower bound and upper bound
-    best_bounds = []
-    for instance in df['instance_key'].unique():
-        instance_data = df[df['instance_key'] == instance]
-        
-        # Get best lower bound (minimum non-null)
-        lower_bounds = instance_data['lower_bound'].dropna()
-        best_lower = lower_bounds.min() if len(lower_bounds) > 0 else None
-        
-        # Get best upper bound (minimum non-null)
-        upper_bounds = instance_data['upper_bound'].dropna()
-        best_upper = upper_bounds.min() if len(upper_bounds) > 0 else None
-        
-        # Get the original instance name
-        original_name = instance_data['instance_name'].iloc[0]
-        
-        best_bounds.append({
-            'instance_key': instance,
-            'instance_name': original_name,
-            'lower_bound': best_lower,
-            'upper_bound': best_upper,
-            'has_lower': best_lower is not None,
-            'has_upper': best_upper is not None,
-            'num_bound_files': len(instance_data)
-        })
-    
-    best_df = pd.DataFrame(best_bounds)
+    # For each instance, take the minimum (non-null) lower and upper bound
+    best_df = df.groupby('instance_key', sort=False).agg(
+        instance_name=('instance_name', 'first'),
+        lower_bound=('lower_bound', 'min'),
+        upper_bound=('upper_bound', 'min'),
+        num_bound_files=('instance_name', 'size'),
+    ).reset_index()
+    best_df.insert(4, 'has_lower', best_df['lower_bound'].notna())
+    best_df.insert(5, 'has_upper', best_df['upper_bound'].notna())
     return best_df
 
 def main():
@@ -6,36 +6,49 @@ Orchestrates the complete workflow from bounds extraction to final analysis
 
 import os
 import sys
-import subprocess
+import asyncio
+from asyncio.subprocess import PIPE
 from datetime import datetime
 
-def run_script(script_name, description):
-    """Run a Python script and handle errors"""
-    print(f"\n{'='*60}")
-    print(f"STEP: {description}")
-    print('='*60)
+async def run_script(script_name, description):
+    """Run a Python script and handle errors
     
+    The step's output is printed in one block once it finishes, so steps
+    running concurrently do not interleave their logs.
+    """
     try:
-        result = subprocess.run([sys.executable, script_name], 
-                              capture_output=True, text=True, timeout=300)
-        
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-        
-        if result.returncode != 0:
-            print(f"❌ ERROR: {script_name} failed with return code {result.returncode}")
+        proc = await asyncio.create_subprocess_exec(sys.executable, script_name,
+                                                    stdout=PIPE, stderr=PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=300)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            print_step_header(description)
+            print(f"❌ ERROR: {script_name} timed out after 5 minutes")
             return False
-        else:
-            print(f"✅ SUCCESS: {description} completed")
-            return True
-            
-    except subprocess.TimeoutExpired:
-        print(f"❌ ERROR: {script_name} timed out after 5 minutes")
-        return False
     except Exception as e:
+        print_step_header(description)
         print(f"❌ ERROR: Failed to run {script_name}: {e}")
         return False
+    
+    print_step_header(description)
+    print(stdout.decode(errors='replace'))
+    if stderr:
+        print("STDERR:", stderr.decode(errors='replace'))
+    
+    if proc.returncode != 0:
+        print(f"❌ ERROR: {script_name} failed with return code {proc.returncode}")
+        return False
+    else:
+        print(f"✅ SUCCESS: {description} completed")
+        return True
+
+def print_step_header(description):
+    """Print the banner that introduces a pipeline step's output"""
+    print(f"\n{'='*60}")
+    print(f"STEP: {description}")
+    print('='*60)
 
 def check_dependencies():
     """Check if required files and directories exist"""
@@ -73,11 +86,8 @@ def create_output_directories():
         os.makedirs(directory, exist_ok=True)
         print(f"Created directory: {directory}")
 
-def generate_summary_report():
-    """Generate a summary report of all processing"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    report_content = f"""
+# Summary report text; only the timestamp changes between runs
+_REPORT_TMPL = """
 ASP RESULTS PROCESSING PIPELINE REPORT
 Generated: {timestamp}
 =====================================
@@ -122,13 +132,19 @@ USAGE RECOMMENDATIONS:
 - Submit xml_solutions/ files to competitions or validators
 - Reference validation_results.csv for quality assurance
 """
+
+def generate_summary_report():
+    """Generate a summary report of all processing"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    report_content = _REPORT_TMPL.format(timestamp=timestamp)
     
     with open("pipeline_report.txt", "w") as f:
         f.write(report_content)
     
     print("📊 Summary report generated: pipeline_report.txt")
 
-def main():
+async def main():
     """Main pipeline execution"""
     print("🚀 STARTING ASP RESULTS PROCESSING PIPELINE")
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -141,20 +157,23 @@ def main():
     # Create output directories
     create_output_directories()
     
-    # Pipeline steps
-    steps = [
-        ("extract_bounds.py", "Extract reference bounds from RobinX repository"),
-        ("asp_to_xml.py", "Convert ASP results to XML format"),
-        ("analyze_results.py", "Comprehensive results analysis with bounds comparison")
+    # Pipeline stages; the steps within a stage do not depend on each other
+    # and run concurrently (analysis needs the bounds from the first stage)
+    stages = [
+        [("extract_bounds.py", "Extract reference bounds from RobinX repository"),
+         ("asp_to_xml.py", "Convert ASP results to XML format")],
+        [("analyze_results.py", "Comprehensive results analysis with bounds comparison")],
     ]
+    num_steps = sum(len(stage) for stage in stages)
     
     successful_steps = 0
     
-    for script, description in steps:
-        if run_script(script, description):
-            successful_steps += 1
-        else:
-            print(f"❌ PIPELINE STOPPED: {script} failed")
+    for stage in stages:
+        outcomes = await asyncio.gather(*(run_script(script, description) for script, description in stage))
+        successful_steps += sum(outcomes)
+        if not all(outcomes):
+            failed = [script for (script, _), ok in zip(stage, outcomes) if not ok]
+            print(f"❌ PIPELINE STOPPED: {', '.join(failed)} failed")
             break
     
     # Optional validation step (commented out due to parsing issues)
@@ -166,11 +185,11 @@ def main():
     print("⚠️  Validation shows cost extraction works but XML format may need adjustment")
     
     # Generate summary report
-    if successful_steps >= 3:  # All main steps completed
+    if successful_steps >= num_steps:  # All main steps completed
         generate_summary_report()
         
         print(f"\n🎉 PIPELINE COMPLETED SUCCESSFULLY!")
-        print(f"Processed {successful_steps}/{len(steps)} main steps")
+        print(f"Processed {successful_steps}/{num_steps} main steps")
         print("\nOutput files generated:")
         print("  📄 reference_bounds.csv - Competition reference bounds")
         print("  📄 complete_analysis.csv - Comprehensive results analysis")
@@ -185,8 +204,8 @@ def main():
         
         return 0
     else:
-        print(f"❌ PIPELINE FAILED: Only {successful_steps}/{len(steps)} steps completed")
+        print(f"❌ PIPELINE FAILED: Only {successful_steps}/{num_steps} steps completed")
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
\ No newline at end of file
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Helpers for locating solver result files, shared by the processing scripts
+"""
+
+import os
+
+def iter_json(root):
+    """Yield paths of all .json files under root, in os.walk order"""
+    stack = [root]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith('.json'):
+                    yield entry.path
+        stack.extend(reversed(subdirs))
+
+def read_bytes(path):
+    """Read a whole file with one unbuffered os.read call"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
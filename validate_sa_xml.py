@@ -1,65 +1,66 @@
 #!/usr/bin/env python3
 import os
+import re
 import subprocess
 import csv
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+# First number on each line mentioning both "objective" and "value"
+_SA_OBJ_RE = re.compile(r'^(?=.*objective)(?=.*value)[^\d\n]*(\d+)', re.I | re.M)
+
+def validate_sa_file(xml_file, validator_path):
+    """Run RobinX on one SA XML file and parse its output"""
+    instance_name = xml_file.stem.replace("_SA", "")
+    try:
+        # Run RobinX validator directly, without an intermediate shell
+        cmd = [validator_path, str(xml_file)]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        
+        # Parse validation output
+        validation_status = "UNKNOWN"
+        objective_value = None
+        
+        if result.returncode == 0:
+            # The last objective line wins
+            objectives = _SA_OBJ_RE.findall(result.stdout)
+            if objectives:
+                objective_value = int(objectives[-1])
+            # "invalid" contains "valid", so any mention counts as VALID
+            if 'valid' in result.stdout.lower():
+                validation_status = "VALID"
+        
+        return {
+            'Instance': instance_name,
+            'XMLFile': xml_file.name,
+            'ValidationStatus': validation_status,
+            'ValidatedObjective': objective_value,
+            'ValidatorOutput': result.stdout.strip(),
+            'ValidatorError': result.stderr.strip()
+        }
+        
+    except Exception as e:
+        print(f"Error validating {xml_file}: {e}")
+        return {
+            'Instance': instance_name,
+            'XMLFile': xml_file.name,
+            'ValidationStatus': "ERROR",
+            'ValidatedObjective': None,
+            'ValidatorOutput': "",
+            'ValidatorError': str(e)
+        }
 
 def validate_sa_xml_files():
     xml_dir = "sa_xml_solutions"
     validator_path = "Validation/RobinX/RobinX"
-    results = []
     
     xml_files = list(Path(xml_dir).glob("*.xml"))
     print(f"Validating {len(xml_files)} SA XML files...")
     
-    for xml_file in xml_files:
-        try:
-            # Run RobinX validator
-            cmd = f"{validator_path} {xml_file}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
-            
-            instance_name = xml_file.stem.replace("_SA", "")
-            
-            # Parse validation output
-            validation_status = "UNKNOWN"
-            objective_value = None
-            
-            if result.returncode == 0:
-                output_lines = result.stdout.split('\n')
-                for line in output_lines:
-                    if 'objective' in line.lower() and 'value' in line.lower():
-                        try:
-                            # Extract objective value
-                            import re
-                            match = re.search(r'(\d+)', line)
-                            if match:
-                                objective_value = int(match.group(1))
-                        except:
-                            pass
-                    if 'valid' in line.lower():
-                        validation_status = "VALID"
-                    elif 'invalid' in line.lower():
-                        validation_status = "INVALID"
-            
-            results.append({
-                'Instance': instance_name,
-                'XMLFile': xml_file.name,
-                'ValidationStatus': validation_status,
-                'ValidatedObjective': objective_value,
-                'ValidatorOutput': result.stdout.strip(),
-                'ValidatorError': result.stderr.strip()
-            })
-            
-        except Exception as e:
-            print(f"Error validating {xml_file}: {e}")
-            results.append({
-                'Instance': instance_name,
-                'XMLFile': xml_file.name,
-                'ValidationStatus': "ERROR",
-                'ValidatedObjective': None,
-                'ValidatorOutput': "",
-                'ValidatorError': str(e)
-            })
+    # Each validation is a separate RobinX process, so run them concurrently
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(validate_sa_file, xml_files, repeat(validator_path)))
     
     # Save validation results
     output_file = "sa_validation_results.csv"
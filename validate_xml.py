@@ -6,18 +6,60 @@ Validates generated XML solution files against their corresponding instances
 
 import os
 import re
+import sys
+import argparse
+import hashlib
 import subprocess
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-import xml.etree.ElementTree as ET
-import json
+
+# lxml parses in libxml2 and is much faster; fall back to the stdlib parser
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+# orjson parses and serializes in C and is much faster; fall back to the stdlib
+try:
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    from json import loads as json_loads, dumps as _json_dumps
+
+    def json_dumps(obj):
+        return _json_dumps(obj).encode()
+
+CACHE_DIR = ".cache"
+ASP_COST_CACHE_DIR = os.path.join(CACHE_DIR, "asp_costs")
+ROBINX_CACHE_DIR = os.path.join(CACHE_DIR, "robinx")
+
+# Number of validated files reported per progress write
+PROGRESS_BATCH = 16
+
+# Columns of the validation results, in the order they are saved
+OUTPUT_COLUMNS = [
+    'solution_file', 'instance_file', 'instance_key', 'category', 'number', 'configuration',
+    'validation_successful', 'asp_cost', 'validation_objective', 'cost_match', 'cost_difference',
+    'return_code', 'validation_error', 'status'
+]
+
+_NAME_RE = re.compile(r'([A-Z][a-z]+)_(\d+)_(.+)')
+_RESULT_RE = re.compile(r'([a-z]+)(\d+)_(.+)\.json')
+_INST_RE = re.compile(r'inst(\d+)_([elm])\.xml')
+_LEGACY_INST_RE = re.compile(r'ITC2021_([A-Za-z]+)_(\d+)\.xml')
+# Whitespace within one line, so a match never spans lines
+_OBJ_RE = re.compile(r'Objective:[^\S\n]+(\d+)[^\S\n]+(\d+)')
+
+# Hits and misses of the on-disk ASP cost cache, reported after validation
+_asp_cost_cache_stats = {'hits': 0, 'misses': 0}
 
 def extract_instance_from_solution_name(solution_filename):
     """Extract instance info from solution XML filename
     e.g., Early_12_BB2.xml -> ('Early', '12', 'BB2')
     """
     base = solution_filename.replace('.xml', '')
-    match = re.match(r'([A-Z][a-z]+)_(\d+)_(.+)', base)
+    match = _NAME_RE.match(base)
     if match:
         category = match.group(1)
         number = match.group(2)
@@ -25,51 +67,89 @@ def extract_instance_from_solution_name(solution_filename):
         return category, number, config
     return None, None, None
 
+@lru_cache(maxsize=None)
+def _instance_index(instances_dir):
+    """Map (category initial, number) to instance path, scanning instances_dir once"""
+    index, legacy = {}, {}
+    try:
+        names = os.listdir(instances_dir)
+    except OSError:
+        return index
+    
+    for name in names:
+        match = _INST_RE.fullmatch(name)
+        if match:
+            index[(match.group(2), match.group(1))] = os.path.join(instances_dir, name)
+            continue
+        match = _LEGACY_INST_RE.fullmatch(name)
+        if match:
+            legacy[(match.group(1).lower()[0], match.group(2))] = os.path.join(instances_dir, name)
+    
+    # The inst{N}_{e|l|m}.xml format takes precedence over the old format
+    return {**legacy, **index}
+
 def find_instance_file(category, number, instances_dir="Validation/RobinX/Repository/ITC2021/Instances/"):
     """Find the corresponding instance XML file"""
-    # Try the inst{N}_{e|l|m}.xml format first
     category_short = category.lower()[0]  # early->e, late->l, middle->m
-    instance_filename = f"inst{number}_{category_short}.xml"
-    instance_path = os.path.join(instances_dir, instance_filename)
-    
-    if os.path.exists(instance_path):
-        return instance_path
-    
-    # Fall back to old format
-    instance_filename = f"ITC2021_{category}_{number}.xml"
-    instance_path = os.path.join(instances_dir, instance_filename)
-    
-    if os.path.exists(instance_path):
-        return instance_path
-    
-    return None
+    return _instance_index(instances_dir).get((category_short, str(number)))
 
 def extract_objective_from_output(output_text):
     """Extract objective value from RobinX output
     Output format: Objective:             0                   1635
     """
-    try:
-        lines = output_text.strip().split('\n')
-        for line in lines:
-            if 'Objective:' in line:
-                # Use regex to extract the numbers from the objective line
-                import re
-                match = re.search(r'Objective:\s+(\d+)\s+(\d+)', line)
-                if match:
-                    infeasible = int(match.group(1))
-                    objective = int(match.group(2))
-                    return objective  # Return the second number (actual objective)
-    except Exception as e:
-        print(f"Error parsing objective: {e}")
+    match = _OBJ_RE.search(output_text)
+    if match:
+        return int(match.group(2))  # Return the second number (actual objective)
     
     return None
 
+def _cache_key(solution_path, instance_path, robinx_path):
+    """Digest of the solution and instance contents and the RobinX binary's path and mtime"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(solution_path, 'rb') as f:
+        digest.update(f.read())
+    digest.update(b'|')
+    with open(instance_path, 'rb') as f:
+        digest.update(f.read())
+    digest.update(f"|{os.path.abspath(robinx_path)}\0{os.stat(robinx_path).st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+def run_robinx(solution_path, instance_path, robinx_path):
+    """Run RobinX on a solution, reusing the cached run for identical inputs"""
+    cmd = [robinx_path, "-i", instance_path, "-s", solution_path]
+    cache_file = os.path.join(ROBINX_CACHE_DIR,
+                              f"{_cache_key(solution_path, instance_path, robinx_path)}.json")
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = json_loads(f.read())
+        return subprocess.CompletedProcess(cmd, cached['return_code'],
+                                           cached['stdout'], cached['stderr'])
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    # Run RobinX validator with shorter timeout to handle segfaults
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    
+    # Only cache actual verdicts; crashes, signals and loader or environment
+    # failures must be retried on the next run
+    is_verdict = (result.returncode >= 0 and result.stdout
+                  and (result.returncode == 0 or _OBJ_RE.search(result.stdout)))
+    if not is_verdict:
+        return result
+    
+    try:
+        os.makedirs(ROBINX_CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            f.write(json_dumps({'return_code': result.returncode, 'stdout': result.stdout,
+                                'stderr': result.stderr}))
+    except OSError as e:
+        print(f"Could not cache RobinX output for {solution_path}: {e}")
+    return result
+
 def validate_single_xml(solution_path, instance_path, robinx_path="Validation/RobinX/RobinX"):
     """Validate a single XML solution file"""
     try:
-        # Run RobinX validator with shorter timeout to handle segfaults
-        cmd = [robinx_path, "-i", instance_path, "-s", solution_path]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        result = run_robinx(solution_path, instance_path, robinx_path)
         
         # Parse results
         validation_result = {
@@ -77,13 +157,21 @@ def validate_single_xml(solution_path, instance_path, robinx_path="Validation/Ro
             'instance_file': os.path.basename(instance_path),
             'return_code': result.returncode,
             'validation_successful': result.returncode == 0,
-            'stdout': result.stdout,
-            'stderr': result.stderr,
             'validation_objective': None,
             'validation_error': None,
             'status': 'UNKNOWN'
         }
         
+        # A crashed run, or an Error 3 run with no stdout, has no usable objective
+        if result.returncode == -11:  # SIGSEGV
+            validation_result['status'] = 'SEGFAULT'
+            validation_result['validation_error'] = 'Segmentation fault'
+            return validation_result
+        if result.returncode == 3 and not result.stdout:
+            validation_result['status'] = 'ERROR_3'
+            validation_result['validation_error'] = 'RobinX Error 3 - possible parsing issue'
+            return validation_result
+        
         # Extract objective value regardless of return code if present
         validation_objective = extract_objective_from_output(result.stdout + result.stderr)
         validation_result['validation_objective'] = validation_objective
@@ -91,9 +179,6 @@ def validate_single_xml(solution_path, instance_path, robinx_path="Validation/Ro
         if result.returncode == 0:
             validation_result['status'] = 'VALID'
             validation_result['validation_successful'] = True
-        elif result.returncode == -11:  # SIGSEGV
-            validation_result['status'] = 'SEGFAULT'
-            validation_result['validation_error'] = 'Segmentation fault'
         elif result.returncode == 3:
             validation_result['status'] = 'ERROR_3'  
             validation_result['validation_error'] = 'RobinX Error 3 - possible parsing issue'
@@ -115,8 +200,6 @@ def validate_single_xml(solution_path, instance_path, robinx_path="Validation/Ro
             'instance_file': os.path.basename(instance_path),
             'return_code': -1,
             'validation_successful': False,
-            'stdout': '',
-            'stderr': 'Validation timeout',
             'validation_objective': None,
             'validation_error': 'Timeout after 10 seconds',
             'status': 'TIMEOUT'
@@ -127,64 +210,105 @@ def validate_single_xml(solution_path, instance_path, robinx_path="Validation/Ro
             'instance_file': os.path.basename(instance_path),
             'return_code': -1,
             'validation_successful': False,
-            'stdout': '',
-            'stderr': str(e),
             'validation_objective': None,
             'validation_error': str(e),
             'status': 'EXCEPTION'
         }
 
-def extract_asp_cost_from_json(xml_filename):
-    """Extract the original ASP cost from corresponding JSON file"""
-    try:
-        # Convert XML filename back to JSON filename format
-        # e.g., Early_12_BB2.xml -> early12_BB2.json
-        base = xml_filename.replace('.xml', '')
-        match = re.match(r'([A-Z][a-z]+)_(\d+)_(.+)', base)
-        if match:
-            category = match.group(1).lower()  # Early -> early
-            number = match.group(2)            # 12
-            config = match.group(3)            # BB2
-            
-            json_filename = f"{category}{number}_{config}.json"
-            
-            # Look for JSON file in main_exp directory structure
-            possible_paths = [
-                f"Results/main_exp/{category}/{json_filename}",
-                f"Results/main_exp/{json_filename}",
-            ]
+def parse_asp_cost(json_path):
+    """Best (lowest) first-level cost over all witnesses in a clingo JSON file"""
+    with open(json_path, 'rb') as f:
+        data = json_loads(f.read())
+    
+    # Extract best cost from JSON (same logic as asp_to_xml.py)
+    calls = data.get("Call", [])
+    if calls:
+        witnesses = calls[0].get("Witnesses", [])
+        if witnesses:
+            best_cost = float('inf')
+            for witness in witnesses:
+                witness_costs = witness.get("Costs", [])
+                if witness_costs:
+                    witness_cost = witness_costs[0]
+                    if witness_cost < best_cost:
+                        best_cost = witness_cost
             
-            for json_path in possible_paths:
-                if os.path.exists(json_path):
-                    with open(json_path, 'r') as f:
-                        data = json.load(f)
-                    
-                    # Extract best cost from JSON (same logic as asp_to_xml.py)
-                    calls = data.get("Call", [])
-                    if calls:
-                        witnesses = calls[0].get("Witnesses", [])
-                        if witnesses:
-                            best_cost = float('inf')
-                            for witness in witnesses:
-                                witness_costs = witness.get("Costs", [])
-                                if witness_costs:
-                                    witness_cost = witness_costs[0]
-                                    if witness_cost < best_cost:
-                                        best_cost = witness_cost
-                            
-                            if best_cost != float('inf'):
-                                return int(best_cost)
-                    
-                    break
+            if best_cost != float('inf'):
+                return int(best_cost)
+    
+    return None
+
+def load_asp_cost(json_path):
+    """parse_asp_cost, reusing the cached cost while the file's mtime is unchanged"""
+    mtime = os.stat(json_path).st_mtime_ns
+    key = hashlib.sha1(f"{json_path}\0{mtime}".encode()).hexdigest()
+    cache_file = os.path.join(ASP_COST_CACHE_DIR, f"{key}.json")
+    try:
+        with open(cache_file, 'rb') as f:
+            cost = json_loads(f.read())['cost']
+        _asp_cost_cache_stats['hits'] += 1
+        return cost
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    _asp_cost_cache_stats['misses'] += 1
+    cost = parse_asp_cost(json_path)
+    try:
+        os.makedirs(ASP_COST_CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            f.write(json_dumps({'cost': cost}))
+    except OSError as e:
+        print(f"Could not cache ASP cost for {json_path}: {e}")
+    return cost
+
+@lru_cache(maxsize=None)
+def _result_index(results_dir="Results/main_exp"):
+    """Map (category, number, config) to result JSON path, scanning results_dir once
+    
+    Only results_dir itself and its per-category subdirectories are searched.
+    """
+    index, top_level = {}, {}
+    for root, dirs, files in os.walk(results_dir):
+        subdir = os.path.relpath(root, results_dir)
+        if subdir != '.':
+            dirs.clear()
+        for name in files:
+            match = _RESULT_RE.fullmatch(name)
+            if not match:
+                continue
+            key = match.groups()
+            if subdir == '.':
+                top_level[key] = f"{results_dir}/{name}"
+            elif subdir == key[0]:
+                index[key] = f"{results_dir}/{subdir}/{name}"
+    
+    # Files in the category subdirectory take precedence over top-level ones
+    return {**top_level, **index}
+
+@lru_cache(maxsize=None)
+def asp_cost_for(category, number, config):
+    """ASP cost of the result for e.g. ('early', '12', 'BB2'), or None"""
+    json_path = _result_index().get((category, number, config))
+    if json_path is None:
+        return None
+    
+    return load_asp_cost(json_path)
+
+def extract_asp_cost_from_json(category, number, config):
+    """Extract the original ASP cost from the JSON file of a parsed solution name
+    e.g., ('Early', '12', 'BB2') -> early12_BB2.json
+    """
+    try:
+        return asp_cost_for(category.lower(), number, config)
     except Exception as e:
-        print(f"Error extracting ASP cost for {xml_filename}: {e}")
+        print(f"Error extracting ASP cost for {category}_{number}_{config}: {e}")
     
     return None
 
 def extract_asp_cost_from_xml(xml_path):
     """Extract the original ASP cost from the XML solution metadata (legacy)"""
     try:
-        tree = ET.parse(xml_path)
+        tree = ET.parse(str(xml_path))
         root = tree.getroot()
         
         obj_elem = root.find('.//ObjectiveValue')
@@ -197,8 +321,36 @@ def extract_asp_cost_from_xml(xml_path):
     
     return None
 
+def add_solution_info(validation_result, category, number, config, asp_cost):
+    """Add instance details and the ASP/RobinX cost comparison to a validation result"""
+    validation_result['category'] = category.lower()
+    validation_result['number'] = int(number)
+    validation_result['configuration'] = config
+    validation_result['asp_cost'] = asp_cost
+    validation_result['instance_key'] = f"{category.lower()}{number}"
+    
+    # Compare costs
+    if asp_cost is not None and validation_result['validation_objective'] is not None:
+        validation_result['cost_match'] = (asp_cost == validation_result['validation_objective'])
+        validation_result['cost_difference'] = abs(asp_cost - validation_result['validation_objective'])
+    else:
+        validation_result['cost_match'] = None
+        validation_result['cost_difference'] = None
+    
+    return validation_result
+
+def format_validation_status(validation_result):
+    """One-line outcome of a validation"""
+    if validation_result['validation_successful']:
+        if validation_result['cost_match']:
+            return f"  ✓ Valid (cost: {validation_result['asp_cost']})"
+        else:
+            return f"  ⚠ Valid but cost mismatch: ASP={validation_result['asp_cost']}, RobinX={validation_result['validation_objective']}"
+    else:
+        return f"  ✗ Validation failed: {validation_result['validation_error']}"
+
 def validate_all_solutions(solutions_dir="xml_solutions",
-                          sample_size=None, skip_unknown=True):
+                          sample_size=None, skip_unknown=True, max_workers=None):
     """Validate all XML solution files"""
     
     solutions_path = Path(solutions_dir)
@@ -215,11 +367,9 @@ def validate_all_solutions(solutions_dir="xml_solutions",
     else:
         print(f"Validating {len(xml_files)} XML files...")
     
-    validation_results = []
-    
-    for i, xml_file in enumerate(xml_files, 1):
-        print(f"Processing {i}/{len(xml_files)}: {xml_file.name}")
-        
+    # Resolve instance files and ASP costs up front, then validate in parallel
+    jobs = []
+    for xml_file in xml_files:
         # Extract instance info
         category, number, config = extract_instance_from_solution_name(xml_file.name)
         if not category or not number:
@@ -233,7 +383,7 @@ def validate_all_solutions(solutions_dir="xml_solutions",
             continue
         
         # Extract ASP cost from corresponding JSON file
-        asp_cost = extract_asp_cost_from_json(xml_file.name)
+        asp_cost = extract_asp_cost_from_json(category, number, config)
         if asp_cost is None:
             # Fallback to XML extraction (legacy)
             asp_cost = extract_asp_cost_from_xml(xml_file)
@@ -245,36 +395,53 @@ def validate_all_solutions(solutions_dir="xml_solutions",
         #     print(f"  Skipping {xml_file.name} (no solution cost)")
         #     continue
         
-        # Validate
-        validation_result = validate_single_xml(str(xml_file), instance_path)
-        
-        # Add additional info
-        validation_result['category'] = category.lower()
-        validation_result['number'] = int(number)
-        validation_result['configuration'] = config
-        validation_result['asp_cost'] = asp_cost
-        validation_result['instance_key'] = f"{category.lower()}{number}"
-        
-        # Compare costs
-        if asp_cost is not None and validation_result['validation_objective'] is not None:
-            validation_result['cost_match'] = (asp_cost == validation_result['validation_objective'])
-            validation_result['cost_difference'] = abs(asp_cost - validation_result['validation_objective'])
-        else:
-            validation_result['cost_match'] = None
-            validation_result['cost_difference'] = None
+        jobs.append((xml_file, instance_path, category, number, config, asp_cost))
+    
+    if len(jobs) <= 2:
+        # Too few files to be worth starting a pool; validate them in turn
+        completed = ((idx, validate_single_xml(str(job[0]), job[1]))
+                     for idx, job in enumerate(jobs))
+        validation_results = collect_validation_results(jobs, completed)
+    else:
+        # RobinX runs as a child process, so threads overlap the validations
+        if max_workers is None:
+            max_workers = os.cpu_count()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(validate_single_xml, str(job[0]), job[1]): idx
+                       for idx, job in enumerate(jobs)}
+            completed = ((futures[future], future.result()) for future in as_completed(futures))
+            validation_results = collect_validation_results(jobs, completed)
+    
+    print(f"ASP cost cache: {_asp_cost_cache_stats['hits']} hits, "
+          f"{_asp_cost_cache_stats['misses']} misses")
+    
+    return pd.DataFrame(validation_results, columns=OUTPUT_COLUMNS)
+
+def collect_validation_results(jobs, completed):
+    """Annotate and report (job index, result) pairs as they complete
+    
+    Results are stored by job index to keep the input order. Progress lines
+    are written in batches of PROGRESS_BATCH files rather than one by one.
+    """
+    validation_results = [None] * len(jobs)
+    progress = []
+    for i, (idx, result) in enumerate(completed, 1):
+        xml_file, _, category, number, config, asp_cost = jobs[idx]
+        progress.append(f"Validated {i}/{len(jobs)}: {xml_file.name}")
         
-        validation_results.append(validation_result)
+        validation_result = add_solution_info(result, category, number, config, asp_cost)
+        validation_results[idx] = validation_result
+        progress.append(format_validation_status(validation_result))
         
-        # Print status
-        if validation_result['validation_successful']:
-            if validation_result['cost_match']:
-                print(f"  ✓ Valid (cost: {asp_cost})")
-            else:
-                print(f"  ⚠ Valid but cost mismatch: ASP={asp_cost}, RobinX={validation_result['validation_objective']}")
-        else:
-            print(f"  ✗ Validation failed: {validation_result['validation_error']}")
+        if i % PROGRESS_BATCH == 0:
+            sys.stdout.write('\n'.join(progress) + '\n')
+            progress.clear()
     
-    return pd.DataFrame(validation_results)
+    if progress:
+        sys.stdout.write('\n'.join(progress) + '\n')
+    sys.stdout.flush()
+    
+    return validation_results
 
 def save_validation_results(validation_df, output_file="validation_results.csv"):
     """Save validation results to CSV"""
@@ -282,20 +449,9 @@ def save_validation_results(validation_df, output_file="validation_results.csv")
         print("No validation results to save")
         return
     
-    # Select columns for output
-    output_columns = [
-        'solution_file', 'instance_file', 'instance_key', 'category', 'number', 'configuration',
-        'validation_successful', 'asp_cost', 'validation_objective', 'cost_match', 'cost_difference',
-        'return_code', 'validation_error', 'status'
-    ]
-    
-    # Ensure all columns exist
-    for col in output_columns:
-        if col not in validation_df.columns:
-            validation_df[col] = None
-    
-    output_df = validation_df[output_columns].copy()
-    output_df = output_df.sort_values(['category', 'number', 'configuration'])
+    # Select the output columns, adding any missing ones as empty
+    output_df = validation_df.reindex(columns=OUTPUT_COLUMNS)
+    output_df.sort_values(['category', 'number', 'configuration'], inplace=True)
     
     output_df.to_csv(output_file, index=False)
     print(f"Validation results saved to: {output_file}")
@@ -352,8 +508,20 @@ def print_validation_summary(validation_df):
         for _, row in failed_df.head(3).iterrows():
             print(f"  {row['solution_file']}: {row['validation_error']}")
 
+def positive_int(text):
+    """argparse type for counts that must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
 def main():
     """Main validation function"""
+    parser = argparse.ArgumentParser(description="Validate XML solutions with RobinX")
+    parser.add_argument('--workers', type=positive_int, default=os.cpu_count(),
+                        help="number of RobinX processes to run at once (default: CPU count)")
+    args = parser.parse_args()
+    
     print("Starting XML solution validation...")
     
     # Check if RobinX exists
@@ -364,7 +532,7 @@ def main():
         return
     
     # Validate all solutions (full validation of all 77 files)
-    validation_df = validate_all_solutions()
+    validation_df = validate_all_solutions(max_workers=args.workers)
     
     if not validation_df.empty:
         # Save results
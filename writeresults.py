@@ -16,11 +16,9 @@ if __name__ == "__main__":
     
     # Find the best configuration for each instance and write to a CSV file
     if not results_df.empty and 'Cost' in results_df.columns:
-        best_configs = pd.DataFrame()
-        for instance, group in results_df.groupby('Instance'):
-            if group['Cost'].notna().any():
-                best_config = group.loc[group['Cost'].idxmin()]
-                best_configs = pd.concat([best_configs, best_config.to_frame().T])
+        # Row of the minimum cost per instance, skipping instances without any cost
+        best_idx = results_df.dropna(subset=['Cost']).groupby('Instance')['Cost'].idxmin()
+        best_configs = results_df.loc[best_idx]
 
         if not best_configs.empty:
             best_configs.to_csv("best_main_exp_configurations.csv", index=False)